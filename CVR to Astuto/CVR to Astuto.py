@@ -1,11 +1,24 @@
+import asyncio
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from datetime import datetime, timezone
 import os
 import time
 import logging
 import sys
 import schedule
+import hashlib
 import json
+import re
+import random
+import sqlite3
+import threading
+from array import array
+from bisect import bisect_left
+from collections import deque, namedtuple
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlencode, urlparse, parse_qs
+from concurrent.futures import ThreadPoolExecutor
 
 # Set up logging
 logging.basicConfig(
@@ -18,34 +31,753 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def write_json_atomically(path, data):
+    """Write JSON to a temporary file, fsync it and rename it over path so a crash never leaves a partial file"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+def retry_after_delay(headers):
+    """Seconds requested by a Retry-After header (delta-seconds or HTTP date), or None"""
+    value = headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def rate_limit_reset_delay(headers):
+    """Seconds until X-RateLimit-Reset (epoch seconds or delta-seconds), or None"""
+    value = headers.get('X-RateLimit-Reset')
+    if not value:
+        return None
+    try:
+        reset = float(value)
+    except ValueError:
+        return None
+    if reset > 1e9:  # GitHub sends an epoch timestamp
+        reset -= time.time()
+    return max(0.0, reset)
+
+def backoff_delay(headers, attempt, base, cap):
+    """Wait until the server says the budget returns, else capped exponential backoff with jitter"""
+    delay = retry_after_delay(headers)
+    if delay is None and headers.get('X-RateLimit-Remaining') == '0':
+        delay = rate_limit_reset_delay(headers)
+    if delay is None:
+        delay = min(cap, base * 2 ** attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+    return delay + random.uniform(0, 1)
+
+PostFooter = namedtuple('PostFooter', ['issue_number', 'status', 'labels', 'created_at', 'url'])
+
+# Matches the metadata block written by format_issue_description at the end of a post
+POST_FOOTER_PATTERN = re.compile(
+    r"---\n"
+    r"Originally from GitHub Issue #(?P<issue_number>\d+)\n"
+    r"Status: (?P<status>[^\n]*)\n"
+    r"Labels: (?P<labels>[^\n]*)\n"
+    r"Created at: (?P<created_at>[^\n]*)\n"
+    r"Original URL: \[(?P<url>[^\]]*)\]"
+)
+ISSUE_NUMBER_PATTERN = re.compile(r"GitHub Issue #(\d+)")
+
+def parse_post_footer(description):
+    """Parse the trailing metadata footer of a synced post, or return None if it has none"""
+    footer_start = description.rfind('---\n')
+    match = POST_FOOTER_PATTERN.match(description, footer_start) if footer_start != -1 else None
+    if not match:
+        # Footer was edited by hand; keep the issue link so the post is still matched
+        number_match = ISSUE_NUMBER_PATTERN.search(description)
+        if not number_match:
+            return None
+        return PostFooter(int(number_match.group(1)), None, frozenset(), None, None)
+    labels = frozenset(label.strip() for label in match.group('labels').split(',') if label.strip())
+    return PostFooter(
+        int(match.group('issue_number')),
+        match.group('status'),
+        labels,
+        match.group('created_at'),
+        match.group('url')
+    )
+
+def iso_to_epoch(value):
+    """Epoch seconds of an ISO 8601 timestamp such as GitHub's 2024-01-01T00:00:00Z (naive means UTC)"""
+    moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+def epoch_to_iso(value):
+    return datetime.fromtimestamp(value, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def issue_fingerprint(issue):
+    """Stable hash of the issue fields that are rendered into its Astuto post"""
+    body = (issue.get('body') or '').replace('\r\n', '\n').strip()
+    labels = sorted(label['name'] for label in issue.get('labels', []))
+    content = json.dumps([issue['title'].strip(), body, issue['state'], labels], ensure_ascii=False)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+GITHUB_ISSUES_QUERY = """
+query($owner: String!, $repo: String!, $first: Int!, $after: String, $since: DateTime) {
+  repository(owner: $owner, name: $repo) {
+    issues(first: $first, after: $after, orderBy: {field: UPDATED_AT, direction: DESC}, filterBy: {since: $since}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        title
+        body
+        state
+        labels(first: 100) { nodes { name } }
+        createdAt
+        updatedAt
+        url
+      }
+    }
+  }
+}
+"""
+
+# The pullRequests connection has no since filter, so it is read newest first and cut off by the caller
+GITHUB_PULL_REQUESTS_QUERY = """
+query($owner: String!, $repo: String!, $first: Int!, $after: String) {
+  repository(owner: $owner, name: $repo) {
+    pullRequests(first: $first, after: $after, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        title
+        body
+        state
+        labels(first: 100) { nodes { name } }
+        createdAt
+        updatedAt
+        url
+      }
+    }
+  }
+}
+"""
+
+def issue_from_graphql_node(node, pull_request=False):
+    """Convert an issue or pull request node to the shape the REST issues endpoint returns"""
+    issue = {
+        'number': node['number'],
+        'title': node['title'],
+        'body': node['body'] or None,  # GraphQL sends "" where REST sends null
+        'state': 'closed' if node['state'] == 'MERGED' else node['state'].lower(),
+        'labels': [{'name': label['name']} for label in node['labels']['nodes']],
+        'created_at': node['createdAt'],
+        'updated_at': node['updatedAt'],
+        'html_url': node['url']
+    }
+    if pull_request:
+        issue['pull_request'] = {'html_url': node['url']}
+    return issue
+
 class RateLimiter:
-    def __init__(self, requests_per_window=100, window_size=300):  # 100 requests per 5 minutes (300 seconds)
+    """Token bucket limiter: tokens refill at requests_per_window / window_size per second, up to burst"""
+    def __init__(self, requests_per_window=100, window_size=300, burst=10):  # 100 requests per 5 minutes (300 seconds)
         self.requests_per_window = requests_per_window
         self.window_size = window_size
-        self.requests = []
+        self.rate = requests_per_window / window_size
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        current_time = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (current_time - self.last_refill) * self.rate)
+        self.last_refill = current_time
         
     def can_make_request(self):
-        current_time = time.time()
-        # Remove requests older than window_size
-        self.requests = [req_time for req_time in self.requests 
-                        if current_time - req_time < self.window_size]
-        
-        return len(self.requests) < self.requests_per_window
+        with self.lock:
+            self._refill()
+            return self.tokens >= 1
     
     def add_request(self):
-        self.requests.append(time.time())
+        with self.lock:
+            self._refill()
+            self.tokens -= 1
     
     def wait_time(self):
-        if not self.requests:
-            return 0
+        with self.lock:
+            self._refill()
+            return max(0, (1 - self.tokens) / self.rate)
+
+    def acquire(self):
+        """Block until a token is available and take it"""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_time = (1 - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+    def estimate_duration(self, request_count):
+        """Seconds the limiter would need to let request_count requests through from now"""
+        with self.lock:
+            self._refill()
+            return max(0, request_count - self.tokens) / self.rate
+
+    def set_rate(self, requests_per_window):
+        with self.lock:
+            self._refill()
+            self.requests_per_window = requests_per_window
+            self.rate = requests_per_window / self.window_size
+
+    def record_success(self):
+        pass
+
+    def record_throttle(self):
+        pass
+
+class AdaptiveRateLimiter(RateLimiter):
+    """Token bucket whose rate grows additively on success and halves on 429 (AIMD)"""
+    def __init__(self, requests_per_window=100, window_size=300, burst=10,
+                 min_requests_per_window=10, max_requests_per_window=1000,
+                 additive_increase=5, multiplicative_decrease=0.5, decrease_cooldown=10):
+        super().__init__(requests_per_window, window_size, burst)
+        self.min_requests_per_window = min_requests_per_window
+        self.max_requests_per_window = max_requests_per_window
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.decrease_cooldown = decrease_cooldown
+        self.last_decrease = 0
+
+    def record_success(self):
+        # Grow by additive_increase requests per window for every window's worth of successes
+        with self.lock:
+            self._refill()
+            self.requests_per_window = min(self.max_requests_per_window,
+                                           self.requests_per_window + self.additive_increase / self.requests_per_window)
+            self.rate = self.requests_per_window / self.window_size
+
+    def record_throttle(self):
+        with self.lock:
+            current_time = time.monotonic()
+            # Concurrent 429s from the same burst only count once
+            if current_time - self.last_decrease < self.decrease_cooldown:
+                return
+            self.last_decrease = current_time
+            self._refill()
+            self.requests_per_window = max(self.min_requests_per_window,
+                                           self.requests_per_window * self.multiplicative_decrease)
+            self.rate = self.requests_per_window / self.window_size
+            self.tokens = min(self.tokens, 0)
+        logger.warning(f"Throttled by server, lowering rate to {self.requests_per_window:.1f} requests per {self.window_size}s")
+
+PendingWrite = namedtuple('PendingWrite', ['kind', 'issue_number', 'issue', 'existing_post', 'fingerprint'])
+
+class WriteQueue:
+    """Pending Astuto writes keyed by issue number (one post per issue), merged until flushed"""
+    def __init__(self, window=0):
+        self.window = window
+        self.pending = {}
+        self.coalesced = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    def add(self, write):
+        with self.lock:
+            previous = self.pending.get(write.issue_number)
+            if previous:
+                self.coalesced += 1
+                # A post that is not created yet is created with the latest content
+                if previous.kind == 'create':
+                    write = write._replace(kind='create', existing_post=None)
+            elif not self.pending:
+                self.opened_at = time.monotonic()
+            self.pending[write.issue_number] = write
+
+    def due(self):
+        with self.lock:
+            return bool(self.pending) and time.monotonic() - self.opened_at >= self.window
+
+    def drain(self):
+        """Return the net writes and how many were merged away"""
+        with self.lock:
+            writes, coalesced = list(self.pending.values()), self.coalesced
+            self.pending = {}
+            self.coalesced = 0
+            self.opened_at = None
+            return writes, coalesced
+
+class TrackedDict(dict):
+    """Dict that remembers which keys were set or removed since the last save"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dirty = set()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.dirty.add(key)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.dirty.add(key)
+
+    def pop(self, key, *default):
+        self.dirty.add(key)
+        return super().pop(key, *default)
+
+class FixedWidthBytes:
+    """Equal-length byte strings packed back to back in one bytearray, indexed like an array"""
+    def __init__(self, width):
+        self.width = width
+        self.data = bytearray()
+
+    def __len__(self):
+        return len(self.data) // self.width
+
+    def __getitem__(self, index):
+        return bytes(self.data[index * self.width:(index + 1) * self.width])
+
+    def __setitem__(self, index, value):
+        self.data[index * self.width:(index + 1) * self.width] = value
+
+    def __delitem__(self, index):
+        del self.data[index * self.width:(index + 1) * self.width]
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
+
+    def insert(self, index, value):
+        self.data[index * self.width:index * self.width] = value
+
+    def append(self, value):
+        self.data += value
+
+class IssueMap:
+    """Issue number -> value map kept in parallel sorted arrays, with the TrackedDict interface the state stores use
+
+    Keys go in as str or int and come out as str. Subclasses choose the value column and how
+    values are packed into it, so an entry costs a few bytes instead of Python strings and a dict slot.
+    """
+    def __init__(self, entries=None):
+        self.numbers = array('q')
+        self.values = self.new_column()
+        self.dirty = set()
+        self.lock = threading.Lock()
+        for key in sorted(entries or (), key=int):
+            self.load(int(key), entries[key])
+
+    def load(self, number, value):
+        """Add an entry read from storage without marking it dirty; appends when numbers arrive in ascending order"""
+        raw = self.encode(value)
+        with self.lock:
+            if not self.numbers or number > self.numbers[-1]:
+                self.numbers.append(number)
+                self.values.append(raw)
+            else:
+                self._put(number, raw)
+
+    def _find(self, number):
+        # Callers hold self.lock: an insert touches both arrays, so an unlocked reader could pair mismatched entries
+        index = bisect_left(self.numbers, number)
+        return index, index < len(self.numbers) and self.numbers[index] == number
+
+    def _put(self, number, raw):
+        index, found = self._find(number)
+        if found:
+            self.values[index] = raw
+        else:
+            self.numbers.insert(index, number)
+            self.values.insert(index, raw)
+
+    def raw(self, key):
+        """The packed value stored for an issue, or None"""
+        with self.lock:
+            index, found = self._find(int(key))
+            return self.values[index] if found else None
+
+    def __contains__(self, key):
+        return self.raw(key) is not None
+
+    def __getitem__(self, key):
+        raw = self.raw(key)
+        if raw is None:
+            raise KeyError(key)
+        return self.decode(raw)
+
+    def get(self, key, default=None):
+        raw = self.raw(key)
+        return default if raw is None else self.decode(raw)
+
+    def __setitem__(self, key, value):
+        number, raw = int(key), self.encode(value)
+        with self.lock:
+            self._put(number, raw)
+            self.dirty.add(str(number))
+
+    def pop(self, key, *default):
+        number = int(key)
+        with self.lock:
+            index, found = self._find(number)
+            self.dirty.add(str(number))
+            if not found:
+                if default:
+                    return default[0]
+                raise KeyError(key)
+            raw = self.values[index]
+            del self.numbers[index]
+            del self.values[index]
+        return self.decode(raw)
+
+    def __delitem__(self, key):
+        self.pop(key)
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def __iter__(self):
+        with self.lock:
+            numbers = list(self.numbers)
+        return (str(number) for number in numbers)
+
+    def items(self):
+        with self.lock:
+            entries = list(zip(self.numbers, self.values))
+        return [(str(number), self.decode(raw)) for number, raw in entries]
+
+class ProcessedIssues(IssueMap):
+    """processed_issues: ISO timestamps packed as epoch seconds, 8 bytes each"""
+    def new_column(self):
+        return array('q')
+
+    def encode(self, value):
+        return iso_to_epoch(value)
+
+    def decode(self, raw):
+        return epoch_to_iso(raw)
+
+    def updated_epoch(self, key):
+        """Epoch seconds the issue was last processed at, or None"""
+        return self.raw(key)
+
+class Fingerprints(IssueMap):
+    """fingerprints: sha1 hex digests packed as their 20 raw bytes"""
+    def new_column(self):
+        return FixedWidthBytes(20)
+
+    def encode(self, value):
+        raw = bytes.fromhex(value)
+        if len(raw) != 20:
+            raise ValueError(f"Not a sha1 fingerprint: {value}")
+        return raw
+
+    def decode(self, raw):
+        return raw.hex()
+
+class PostIndex(IssueMap):
+    """post_index: Astuto post IDs, 8 bytes each"""
+    def new_column(self):
+        return array('q')
+
+    def encode(self, value):
+        return int(value)
+
+    def decode(self, raw):
+        return raw
+
+# Per-issue and per-post parts of the sync state; everything else is a single watermark value
+ISSUE_STATE_TYPES = {'processed_issues': ProcessedIssues, 'fingerprints': Fingerprints, 'post_index': PostIndex}
+ISSUE_STATE_KEYS = tuple(ISSUE_STATE_TYPES)
+POST_STATE_KEYS = ('post_statuses',)
+
+class JsonStateStore:
+    """Sync state kept as a JSON snapshot plus an append-only journal of changed issues and posts"""
+    def __init__(self, path, compact_after=10000):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.compact_after = compact_after
+        self.journal_records = 0
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            state = {
+                'last_sync': None,
+                'processed_issues': {}
+            }
+        # Each snapshot dict is dropped as soon as its compact map is built
+        for key, map_type in ISSUE_STATE_TYPES.items():
+            state[key] = map_type(state.pop(key, None))
+        state['post_statuses'] = TrackedDict(state.get('post_statuses', {}))
         
-        current_time = time.time()
-        oldest_request = min(self.requests)
-        return max(0, self.window_size - (current_time - oldest_request))
+        try:
+            with open(self.journal_path, 'rb+') as f:
+                good_offset = 0
+                for line in f:
+                    try:
+                        record = json.loads(line) if line.endswith(b'\n') else None
+                    except ValueError:
+                        record = None
+                    if record is None:
+                        # Partial last line from a crash; cut it off so the next append starts on a clean line
+                        logger.warning(f"Discarding a partially written record at the end of {self.journal_path}")
+                        f.truncate(good_offset)
+                        break
+                    self.apply_record(state, record)
+                    self.journal_records += 1
+                    good_offset += len(line)
+        except FileNotFoundError:
+            pass
+        for key in ISSUE_STATE_KEYS + POST_STATE_KEYS:
+            state[key].dirty.clear()
+        return state
+
+    def apply_record(self, state, record):
+        if 'issue' in record:
+            number = str(record['issue'])
+            for key, field in (('processed_issues', 'updated_at'), ('fingerprints', 'fingerprint'), ('post_index', 'post_id')):
+                if record[field] is None:
+                    state[key].pop(number, None)
+                else:
+                    state[key][number] = record[field]
+        elif 'post' in record:
+            if record['status_id'] is None:
+                state['post_statuses'].pop(str(record['post']), None)
+            else:
+                state['post_statuses'][str(record['post'])] = record['status_id']
+        else:
+            state.update(record['meta'])
+
+    def save(self, state):
+        dirty_issues = set().union(*(state[key].dirty for key in ISSUE_STATE_KEYS))
+        dirty_posts = set().union(*(state[key].dirty for key in POST_STATE_KEYS))
+        records = [{
+            'issue': int(number),
+            'updated_at': state['processed_issues'].get(number),
+            'fingerprint': state['fingerprints'].get(number),
+            'post_id': state['post_index'].get(number)
+        } for number in dirty_issues]
+        records.extend({'post': int(post_id), 'status_id': state['post_statuses'].get(post_id)} for post_id in dirty_posts)
+        records.append({'meta': {name: value for name, value in state.items() if name not in ISSUE_STATE_KEYS + POST_STATE_KEYS}})
+        
+        with open(self.journal_path, 'a') as f:
+            f.write(''.join(json.dumps(record) + '\n' for record in records))
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_records += len(records)
+        
+        if self.journal_records >= self.compact_after:
+            self.compact(state)
+
+    def compact(self, state):
+        """Fold the journal into a fresh snapshot; the journal must already hold every change in state"""
+        write_json_atomically(self.path, {name: dict(value.items()) if name in ISSUE_STATE_KEYS + POST_STATE_KEYS else value
+                                          for name, value in state.items()})
+        # The journal ends in the same state as the snapshot, so replaying it after a crash here changes nothing
+        with open(self.journal_path, 'w') as f:
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_records = 0
+
+class SqliteStateStore:
+    """Sync state in SQLite, saving only the issues and posts that changed since the last save"""
+    def __init__(self, path, legacy_json_path=None):
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.legacy_json_path = legacy_json_path
+        self.lock = threading.Lock()
+        with self.lock, self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS issues ("
+                "number INTEGER PRIMARY KEY, "
+                "updated_at TEXT, "
+                "fingerprint TEXT, "
+                "post_id INTEGER)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS issues_post_id ON issues (post_id)")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS post_statuses (post_id INTEGER PRIMARY KEY, status_id INTEGER)"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS watermarks (name TEXT PRIMARY KEY, value TEXT)"
+            )
+
+    def load(self):
+        with self.lock:
+            empty = not self.connection.execute("SELECT 1 FROM watermarks LIMIT 1").fetchone()
+        if empty and self.legacy_json_path and os.path.exists(self.legacy_json_path):
+            self.migrate_from_json()
+        
+        state = {key: map_type() for key, map_type in ISSUE_STATE_TYPES.items()}
+        state['last_sync'] = None
+        with self.lock:
+            # Rows go straight into the compact maps, in number order so every load is an append
+            for number, updated_at, fingerprint, post_id in self.connection.execute(
+                    "SELECT number, updated_at, fingerprint, post_id FROM issues ORDER BY number"):
+                if updated_at is not None:
+                    state['processed_issues'].load(number, updated_at)
+                if fingerprint is not None:
+                    state['fingerprints'].load(number, fingerprint)
+                if post_id is not None:
+                    state['post_index'].load(number, post_id)
+            state['post_statuses'] = TrackedDict(
+                (str(post_id), status_id)
+                for post_id, status_id in self.connection.execute("SELECT post_id, status_id FROM post_statuses")
+            )
+            for name, value in self.connection.execute("SELECT name, value FROM watermarks"):
+                state[name] = json.loads(value)
+        return state
+
+    def migrate_from_json(self):
+        """One-time import of an existing last_sync.json"""
+        state = JsonStateStore(self.legacy_json_path).load()
+        for key in ISSUE_STATE_KEYS + POST_STATE_KEYS:
+            state[key].dirty = set(state[key])
+        self.save(state)
+        logger.info(f"Migrated sync state for {len(state['processed_issues'])} issues from {self.legacy_json_path}")
+
+    def save(self, state):
+        dirty_issues = set().union(*(state[key].dirty for key in ISSUE_STATE_KEYS))
+        dirty_posts = set().union(*(state[key].dirty for key in POST_STATE_KEYS))
+        with self.lock, self.connection:
+            for number in dirty_issues:
+                row = (state['processed_issues'].get(number), state['fingerprints'].get(number), state['post_index'].get(number))
+                if row == (None, None, None):
+                    self.connection.execute("DELETE FROM issues WHERE number = ?", (int(number),))
+                else:
+                    self.connection.execute(
+                        "INSERT INTO issues (number, updated_at, fingerprint, post_id) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(number) DO UPDATE SET updated_at = excluded.updated_at, "
+                        "fingerprint = excluded.fingerprint, post_id = excluded.post_id",
+                        (int(number),) + row
+                    )
+            for post_id in dirty_posts:
+                status_id = state['post_statuses'].get(post_id)
+                if status_id is None:
+                    self.connection.execute("DELETE FROM post_statuses WHERE post_id = ?", (int(post_id),))
+                else:
+                    self.connection.execute(
+                        "INSERT INTO post_statuses (post_id, status_id) VALUES (?, ?) "
+                        "ON CONFLICT(post_id) DO UPDATE SET status_id = excluded.status_id",
+                        (int(post_id), status_id)
+                    )
+            for name, value in state.items():
+                if name not in ISSUE_STATE_KEYS + POST_STATE_KEYS:
+                    self.connection.execute(
+                        "INSERT INTO watermarks (name, value) VALUES (?, ?) "
+                        "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+                        (name, json.dumps(value))
+                    )
+
+class Outbox:
+    """SQLite log of planned Astuto writes; entries are recorded before they run and marked done after"""
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS outbox ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "kind TEXT NOT NULL, "
+                "issue_number INTEGER NOT NULL, "
+                "payload TEXT NOT NULL, "
+                "done INTEGER NOT NULL DEFAULT 0)"
+            )
+
+    def record(self, entries):
+        """Record (kind, issue_number, payload) entries in one transaction and return their ids"""
+        ids = []
+        with self.lock, self.connection:
+            for kind, issue_number, payload in entries:
+                cursor = self.connection.execute(
+                    "INSERT INTO outbox (kind, issue_number, payload) VALUES (?, ?, ?)",
+                    (kind, issue_number, json.dumps(payload))
+                )
+                ids.append(cursor.lastrowid)
+        return ids
+
+    def mark_done(self, entry_id):
+        with self.lock, self.connection:
+            self.connection.execute("UPDATE outbox SET done = 1 WHERE id = ?", (entry_id,))
+
+    def pending(self):
+        """Unfinished entries as (id, kind, issue_number, payload), oldest first"""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT id, kind, issue_number, payload FROM outbox WHERE done = 0 ORDER BY id"
+            ).fetchall()
+        return [(entry_id, kind, issue_number, json.loads(payload)) for entry_id, kind, issue_number, payload in rows]
+
+    def purge_done(self):
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM outbox WHERE done = 1")
+
+class EtagCache:
+    """GitHub page validators and bodies in SQLite; a body is only read back when its page comes back 304
+
+    Pages are grouped by variant ('full' or 'incremental') so the hourly incremental fetches
+    do not evict the pages of the daily full fetch.
+    """
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.connection:
+            columns = [row[1] for row in self.connection.execute("PRAGMA table_info(pages)")]
+            if columns and 'variant' not in columns:
+                self.connection.execute("DROP TABLE pages")  # Cache from before variants; refetching rebuilds it
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "cache_key TEXT PRIMARY KEY, "
+                "variant TEXT NOT NULL, "
+                "etag TEXT, "
+                "last_modified TEXT, "
+                "link TEXT, "
+                "body TEXT NOT NULL)"
+            )
+
+    def validators(self, cache_key):
+        """(etag, last_modified, link) cached for a page, or None"""
+        with self.lock:
+            return self.connection.execute(
+                "SELECT etag, last_modified, link FROM pages WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+
+    def body(self, cache_key):
+        with self.lock:
+            row = self.connection.execute("SELECT body FROM pages WHERE cache_key = ?", (cache_key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def store(self, cache_key, variant, etag, last_modified, link, body):
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT INTO pages (cache_key, variant, etag, last_modified, link, body) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(cache_key) DO UPDATE SET variant = excluded.variant, etag = excluded.etag, "
+                "last_modified = excluded.last_modified, link = excluded.link, body = excluded.body",
+                (cache_key, variant, etag, last_modified, link, body)
+            )
+
+    def prune(self, used_keys, variant):
+        """Drop pages of this variant that the last fetch did not request"""
+        with self.lock, self.connection:
+            stale = [(cache_key,) for (cache_key,) in self.connection.execute(
+                         "SELECT cache_key FROM pages WHERE variant = ?", (variant,))
+                     if cache_key not in used_keys]
+            self.connection.executemany("DELETE FROM pages WHERE cache_key = ?", stale)
 
 class PublicGitHubToAstuto:
-    def __init__(self, astuto_api_key, astuto_base_url):
+    def __init__(self, astuto_api_key, astuto_base_url, max_connections=4, sync_workers=1, github_concurrency=4,
+                 github_backend='rest', github_token=None, streaming=False, coalesce_window=0, state_backend='sqlite',
+                 sync_overlap=300, max_in_flight=None):
         self.github_api_url = "https://api.github.com"
+        self.github_backend = github_backend
+        self.github_token = github_token
         self.astuto_headers = {
             'Authorization': f'Bearer {astuto_api_key}',
             'Content-Type': 'application/json',
@@ -55,11 +787,49 @@ class PublicGitHubToAstuto:
         self.astuto_boards = {}
         self.astuto_statuses = {}
         self.last_sync_file = "last_sync.json"
-        self.rate_limiter = RateLimiter()
+        if state_backend == 'json':
+            self.state_store = JsonStateStore(self.last_sync_file)
+        else:
+            self.state_store = SqliteStateStore("sync_state.db", legacy_json_path=self.last_sync_file)
+        self.etag_cache = EtagCache("github_etag_cache.db")
+        self.posts_page_size = 100
+        self.full_sync_interval = 24 * 60 * 60  # Deleted GitHub issues are only detected by a full fetch
+        self.sync_overlap = sync_overlap  # seconds the next since filter reaches back before the newest issue seen
+        self.max_seen_updated_at = None
+        self.mappings_snapshot_file = "astuto_mappings.json"
+        self.mappings_ttl = 60 * 60
+        self.mappings_refresh_thread = None
+        self.skipped_status_updates = 0
+        self.stats_lock = threading.Lock()
+        self.checkpoint_every = 100  # issues
+        self.checkpoint_interval = 60  # seconds
+        self.unsaved_issues = 0
+        self.last_checkpoint = time.monotonic()
+        self.rate_limiter = AdaptiveRateLimiter()
         self.max_retries = 3
+        self.max_connections = max_connections
+        self.sync_workers = sync_workers
+        self.github_concurrency = github_concurrency
+        self.max_in_flight = max_in_flight or max_connections
+        self.streaming = streaming
+        self.write_queue = WriteQueue(coalesce_window)
+        self.outbox = Outbox("astuto_outbox.db")
+        self.github_session = self.create_session(self.github_api_url)
+        self.astuto_session = self.create_session(self.astuto_base_url)
         self.load_sync_state()
         self.initialize_astuto_mappings()
 
+    def create_session(self, base_url):
+        """Create a keep-alive session with a connection pool sized to the configured concurrency"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size())
+        session.mount(base_url, adapter)
+        return session
+
+    def pool_size(self):
+        """Connections each session keeps alive: enough for the busiest concurrent path"""
+        return max(self.max_connections, self.sync_workers, self.github_concurrency, self.max_in_flight)
+
     def test_connections(self):
         """Test both GitHub and Astuto API connections"""
         connection_status = {
@@ -70,7 +840,7 @@ class PublicGitHubToAstuto:
         # Test GitHub API
         try:
             logger.info("Testing GitHub API connection...")
-            response = requests.get(
+            response = self.github_session.get(
                 f"{self.github_api_url}/rate_limit",
                 headers={'User-Agent': 'GitHub-Issue-Migrator'}
             )
@@ -97,64 +867,121 @@ class PublicGitHubToAstuto:
         for attempt in range(self.max_retries):
             if not self.rate_limiter.can_make_request():
                 wait_time = self.rate_limiter.wait_time()
-                logger.warning(f"Rate limit reached. Waiting {wait_time:.2f} seconds...")
-                time.sleep(wait_time)
+                logger.warning(f"Rate limit reached. Waiting up to {wait_time:.2f} seconds...")
 
             try:
-                self.rate_limiter.add_request()
-                response = requests.request(method, url, **kwargs)
+                self.rate_limiter.acquire()
+                response = self.astuto_session.request(method, url, **kwargs)
                 
                 if response.status_code == 429:  # Too Many Requests
-                    wait_time = 2 ** attempt * 30  # Exponential backoff starting at 30 seconds
-                    logger.warning(f"Rate limit exceeded. Waiting {wait_time} seconds before retry...")
+                    self.rate_limiter.record_throttle()
+                    # Exponential backoff starting at 30 seconds unless the server says otherwise
+                    wait_time = backoff_delay(response.headers, attempt, base=30, cap=300)
+                    logger.warning(f"Rate limit exceeded. Waiting {wait_time:.2f} seconds before retry...")
                     time.sleep(wait_time)
                     continue
                 
                 response.raise_for_status()
+                self.rate_limiter.record_success()
                 return response
                 
             except requests.exceptions.RequestException as e:
                 if attempt == self.max_retries - 1:
                     raise
-                wait_time = 2 ** attempt * 30
-                logger.warning(f"Request failed. Waiting {wait_time} seconds before retry...")
+                response_headers = e.response.headers if e.response is not None else {}
+                wait_time = backoff_delay(response_headers, attempt, base=30, cap=300)
+                logger.warning(f"Request failed. Waiting {wait_time:.2f} seconds before retry...")
                 time.sleep(wait_time)
         
         raise Exception("Max retries exceeded")
 
     def load_sync_state(self):
-        """Load the last sync state from file"""
-        try:
-            with open(self.last_sync_file, 'r') as f:
-                self.sync_state = json.load(f)
-        except FileNotFoundError:
-            self.sync_state = {
-                'last_sync': None,
-                'processed_issues': {}
-            }
+        """Load the last sync state from the state store"""
+        self.sync_state = self.state_store.load()
+        
+        # Start from the rate learned on previous runs
+        if self.sync_state.get('learned_rate'):
+            self.rate_limiter.set_rate(self.sync_state['learned_rate'])
+            logger.info(f"Resuming at learned rate of {self.sync_state['learned_rate']:.1f} requests per {self.rate_limiter.window_size}s")
 
     def save_sync_state(self):
-        """Save the current sync state to file"""
-        with open(self.last_sync_file, 'w') as f:
-            json.dump(self.sync_state, f)
+        """Save the current sync state to the state store"""
+        self.sync_state['learned_rate'] = self.rate_limiter.requests_per_window
+        self.state_store.save(self.sync_state)
+        for key in ISSUE_STATE_KEYS + POST_STATE_KEYS:
+            self.sync_state[key].dirty.clear()
+        self.unsaved_issues = 0
+        self.last_checkpoint = time.monotonic()
+
+    def maybe_checkpoint(self, processed):
+        """Save progress once checkpoint_every issues or checkpoint_interval seconds have passed since the last save"""
+        self.unsaved_issues += processed
+        if (self.unsaved_issues >= self.checkpoint_every or
+                time.monotonic() - self.last_checkpoint >= self.checkpoint_interval):
+            logger.info(f"Checkpointing sync state after {self.unsaved_issues} issues")
+            self.save_sync_state()
 
     def initialize_astuto_mappings(self):
-        """Initialize mappings for Astuto boards and statuses"""
+        """Initialize mappings for Astuto boards and statuses, starting from the on-disk snapshot if there is one"""
+        try:
+            with open(self.mappings_snapshot_file, 'r') as f:
+                self.astuto_snapshot = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.astuto_snapshot = None
+
+        if self.astuto_snapshot:
+            self.apply_astuto_snapshot(self.astuto_snapshot)
+            logger.info(f"Loaded {len(self.astuto_boards)} Astuto boards and {len(self.astuto_statuses)} statuses from snapshot")
+            self.refresh_astuto_mappings_in_background()
+        else:
+            self.refresh_astuto_mappings()
+
+    def apply_astuto_snapshot(self, snapshot):
+        """Resolve board and status IDs from a snapshot"""
+        self.astuto_boards = {board['name'].lower(): str(board['id']) for board in snapshot['boards']}
+        self.astuto_statuses = {status['name'].lower(): status['id'] for status in snapshot['statuses']}
+
+    def refresh_astuto_mappings(self):
+        """Fetch boards and statuses, re-resolving IDs only if they changed since the last snapshot"""
+        previous = self.astuto_snapshot or {'boards': [], 'statuses': []}
+        snapshot = {'fetched_at': time.time(), 'boards': previous['boards'], 'statuses': previous['statuses']}
+        complete = True
+
         try:
             response = self.make_astuto_request('get', f"{self.astuto_base_url}/api/v1/boards", headers=self.astuto_headers)
-            boards = response.json()
-            self.astuto_boards = {board['name'].lower(): str(board['id']) for board in boards}
-            logger.info(f"Loaded {len(self.astuto_boards)} Astuto boards")
+            snapshot['boards'] = response.json()
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching Astuto boards: {e}")
+            complete = False
 
         try:
             response = self.make_astuto_request('get', f"{self.astuto_base_url}/api/v1/post_statuses", headers=self.astuto_headers)
-            statuses = response.json()
-            self.astuto_statuses = {status['name'].lower(): status['id'] for status in statuses}
-            logger.info(f"Loaded {len(self.astuto_statuses)} Astuto statuses")
+            snapshot['statuses'] = response.json()
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching Astuto statuses: {e}")
+            complete = False
+
+        if self.astuto_snapshot is None or snapshot['boards'] != previous['boards'] or snapshot['statuses'] != previous['statuses']:
+            self.apply_astuto_snapshot(snapshot)
+            logger.info(f"Loaded {len(self.astuto_boards)} Astuto boards")
+            logger.info(f"Loaded {len(self.astuto_statuses)} Astuto statuses")
+
+        # A partial fetch must not mark the snapshot as fresh
+        if complete:
+            self.astuto_snapshot = snapshot
+            write_json_atomically(self.mappings_snapshot_file, snapshot)
+
+    def refresh_astuto_mappings_in_background(self):
+        """Refresh boards and statuses on a background thread unless a refresh is already running"""
+        if self.mappings_refresh_thread and self.mappings_refresh_thread.is_alive():
+            return
+        self.mappings_refresh_thread = threading.Thread(target=self.refresh_astuto_mappings, daemon=True)
+        self.mappings_refresh_thread.start()
+
+    def refresh_astuto_mappings_if_stale(self):
+        """Start a background refresh when the snapshot is older than its TTL"""
+        if not self.astuto_snapshot or time.time() - self.astuto_snapshot['fetched_at'] >= self.mappings_ttl:
+            self.refresh_astuto_mappings_in_background()
 
     def determine_board(self, issue_labels):
         """Determine which board to use based on issue labels"""
@@ -265,63 +1092,221 @@ class PublicGitHubToAstuto:
             logger.warning(f"No matching status found in Astuto for post {post_id}")
             return False
 
-    def delete_missing_posts(self, github_issues, existing_posts):
+    def delete_missing_posts(self, github_issues, issue_to_post):
         """Delete posts from Astuto that no longer exist on GitHub"""
         github_issue_numbers = set(issue['number'] for issue in github_issues)
+        return self.delete_posts_not_in(github_issue_numbers, issue_to_post)
+
+    def delete_posts_not_in(self, github_issue_numbers, issue_to_post):
+        """Delete posts whose GitHub issue number is not in github_issue_numbers, using the run's live issue_to_post"""
         deleted_count = 0
+        missing = [(issue_num, post) for issue_num, post in issue_to_post.items() if issue_num not in github_issue_numbers]
+        entry_ids = self.outbox.record(('delete', issue_num, {'post_id': post['id']}) for issue_num, post in missing)
 
-        for post in existing_posts:
-            desc = post.get('description', '')
-            if 'GitHub Issue #' in desc:
-                try:
-                    issue_num = int(desc.split('GitHub Issue #')[1].split('\n')[0])
-                    if issue_num not in github_issue_numbers:
-                        # Delete post from Astuto
-                        url = f"{self.astuto_base_url}/api/v1/posts/{post['id']}"
-                        try:
-                            self.make_astuto_request('delete', url, headers=self.astuto_headers)
-                            logger.info(f"Deleted post {post['id']} (GitHub Issue #{issue_num}) as it no longer exists on GitHub")
-                            deleted_count += 1
-                        except Exception as e:
-                            logger.error(f"Error deleting post {post['id']}: {e}")
-                            if hasattr(e, 'response') and hasattr(e.response, 'text'):
-                                logger.error(f"Response content: {e.response.text}")
-                except (ValueError, IndexError):
-                    continue
+        for entry_id, (issue_num, post) in zip(entry_ids, missing):
+            if self.delete_post(post['id'], issue_num):
+                del issue_to_post[issue_num]
+                deleted_count += 1
+            self.outbox.mark_done(entry_id)
+            self.maybe_checkpoint(1)
 
         if deleted_count > 0:
             logger.info(f"Deleted {deleted_count} posts that no longer exist on GitHub")
         return deleted_count
 
+    def delete_post(self, post_id, issue_num):
+        """Delete a post from Astuto and forget everything stored about it"""
+        url = f"{self.astuto_base_url}/api/v1/posts/{post_id}"
+        try:
+            self.make_astuto_request('delete', url, headers=self.astuto_headers)
+            logger.info(f"Deleted post {post_id} (GitHub Issue #{issue_num}) as it no longer exists on GitHub")
+            self.sync_state['post_index'].pop(str(issue_num), None)
+            self.sync_state['fingerprints'].pop(str(issue_num), None)
+            self.sync_state['post_statuses'].pop(str(post_id), None)
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting post {post_id}: {e}")
+            if hasattr(e, 'response') and hasattr(e.response, 'text'):
+                logger.error(f"Response content: {e.response.text}")
+            return False
+
+    def fetch_github_page(self, url, params, headers):
+        """Fetch one page of GitHub results, sending conditional headers and serving 304s from cache"""
+        cache_key = f"{url}?{urlencode(sorted(params.items()))}"
+        cached = self.etag_cache.validators(cache_key)
+        request_headers = dict(headers)
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                request_headers['If-None-Match'] = etag
+            if last_modified:
+                request_headers['If-Modified-Since'] = last_modified
+
+        for attempt in range(3):
+            try:
+                response = self.github_session.get(
+                    url,
+                    headers=request_headers,
+                    params=params,
+                    timeout=30
+                )
+                response.raise_for_status()
+                break
+            except requests.exceptions.RequestException as e:
+                if attempt == 2:
+                    logger.error(f"Failed to fetch page {params.get('page')} after 3 attempts")
+                    raise
+                response_headers = e.response.headers if e.response is not None else {}
+                wait_time = backoff_delay(response_headers, attempt, base=1, cap=60)
+                logger.warning(f"Attempt {attempt + 1} failed, waiting {wait_time:.2f} seconds...")
+                time.sleep(wait_time)
+
+        if response.status_code == 304 and cached:
+            logger.debug(f"Page {params.get('page')} not modified, using cached copy")
+            body = self.etag_cache.body(cache_key)
+        else:
+            body = response.json()
+            if response.headers.get('ETag') or response.headers.get('Last-Modified'):
+                variant = 'incremental' if 'since' in params else 'full'
+                self.etag_cache.store(cache_key, variant, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                                      response.headers.get('Link'), response.text)
+        return body, response, cache_key
+
+    def github_last_page(self, response, cache_key):
+        """Read the last page number from the Link header (or the cached one on a 304)"""
+        cached = self.etag_cache.validators(cache_key)
+        link = response.headers.get('Link') or (cached[2] if cached else None)
+        if not link:
+            return 1
+        for parsed_link in requests.utils.parse_header_links(link):
+            if parsed_link.get('rel') == 'last':
+                return int(parse_qs(urlparse(parsed_link['url']).query)['page'][0])
+        return 1
+
+    def wait_for_github_budget(self, response):
+        """Sleep until the GitHub rate limit resets when it is running low"""
+        if 'X-RateLimit-Remaining' in response.headers:
+            remaining = int(response.headers['X-RateLimit-Remaining'])
+            if remaining < 10:
+                reset_delay = rate_limit_reset_delay(response.headers)
+                wait_time = (60 if reset_delay is None else reset_delay) + random.uniform(0, 1)
+                logger.warning(f"Rate limit running low, waiting {wait_time:.2f} seconds for reset...")
+                time.sleep(wait_time)
+
+    def github_since(self):
+        """The since filter for GitHub fetches, or None when a full fetch is due"""
+        if time.time() - self.sync_state.get('last_full_sync', 0) >= self.full_sync_interval:
+            return None
+        return self.sync_state['last_sync']
+
+    def note_seen_issues(self, issues):
+        """Track the newest updated_at GitHub has returned this run"""
+        for issue in issues:
+            updated_at = iso_to_epoch(issue['updated_at'])
+            if self.max_seen_updated_at is None or updated_at > self.max_seen_updated_at:
+                self.max_seen_updated_at = updated_at
+
     def get_github_issues(self, owner, repo):
         """Fetch issues from GitHub with date filtering and retry logic"""
+        return [issue for page_issues in self.iter_github_issue_pages(owner, repo) for issue in page_issues]
+
+    def iter_github_issue_pages(self, owner, repo):
+        """Yield pages of GitHub issues as they arrive"""
+        if self.github_backend == 'graphql':
+            yield from self.iter_github_issue_pages_graphql(owner, repo)
+            return
+        
         logger.info(f"Fetching issues from {owner}/{repo}")
+        url = f"{self.github_api_url}/repos/{owner}/{repo}/issues"
         headers = {
             'Accept': 'application/vnd.github.v3+json',
             'User-Agent': 'GitHub-Issue-Migrator'
         }
+        params = {
+            'state': 'all',
+            'per_page': 50,
+            'sort': 'updated',
+            'direction': 'desc'
+        }
         
-        issues = []
+        since = self.github_since()
+        if since:
+            params['since'] = since
+        
+        used_cache_keys = set()
+
+        def fetch_page(page):
+            page_issues, response, cache_key = self.fetch_github_page(url, dict(params, page=page), headers)
+            used_cache_keys.add(cache_key)
+            logger.info(f"Retrieved {len(page_issues)} issues from page {page}")
+            self.wait_for_github_budget(response)
+            return page_issues, response, cache_key
+        
+        first_page, response, cache_key = fetch_page(1)
+        last_page = self.github_last_page(response, cache_key) if first_page else 1
+        self.note_seen_issues(first_page)
+        yield list(first_page)
+        
+        # The first response tells us how many pages there are, so fetch the rest concurrently.
+        # Only github_concurrency pages are fetched ahead of the consumer to keep memory bounded.
+        if last_page > 1:
+            with ThreadPoolExecutor(max_workers=self.github_concurrency) as executor:
+                pending = deque()
+                next_page = 2
+                while pending or next_page <= last_page:
+                    while next_page <= last_page and len(pending) < self.github_concurrency:
+                        pending.append(executor.submit(fetch_page, next_page))
+                        next_page += 1
+                    page_issues = pending.popleft().result()[0]
+                    self.note_seen_issues(page_issues)
+                    yield list(page_issues)
+        
+        self.etag_cache.prune(used_cache_keys, 'incremental' if since else 'full')
+
+    def iter_github_issue_pages_graphql(self, owner, repo):
+        """Yield pages of issues and pull requests from the GraphQL API, requesting only the fields the sync uses"""
+        logger.info(f"Fetching issues from {owner}/{repo} via GraphQL")
+        if not self.github_token:
+            raise ValueError("The GraphQL backend requires a GitHub token")
+        variables = {'owner': owner, 'repo': repo, 'first': 100}
+        since = self.github_since()
+        if since:
+            # GraphQL DateTime needs an explicit offset
+            if not since.endswith('Z') and '+' not in since[10:]:
+                since += 'Z'
+        
+        for nodes in self.iter_github_graphql_pages(GITHUB_ISSUES_QUERY, 'issues', dict(variables, since=since)):
+            page_issues = [issue_from_graphql_node(node) for node in nodes]
+            self.note_seen_issues(page_issues)
+            yield page_issues
+        
+        # The REST issues endpoint lists pull requests as well, so fetch them too to return the same results
+        since_epoch = iso_to_epoch(since) if since else None
+        for nodes in self.iter_github_graphql_pages(GITHUB_PULL_REQUESTS_QUERY, 'pullRequests', variables):
+            page_issues = [issue_from_graphql_node(node, pull_request=True) for node in nodes
+                           if since_epoch is None or iso_to_epoch(node['updatedAt']) >= since_epoch]
+            if page_issues:
+                self.note_seen_issues(page_issues)
+                yield page_issues
+            if len(page_issues) < len(nodes):
+                break  # Sorted by updatedAt, so the rest are older than since
+
+    def iter_github_graphql_pages(self, query, connection_name, variables):
+        """Yield the nodes of a repository connection page by page, following its cursor"""
+        headers = {
+            'Authorization': f'bearer {self.github_token}',
+            'User-Agent': 'GitHub-Issue-Migrator'
+        }
+        variables = dict(variables, after=None)
         page = 1
         
         while True:
-            params = {
-                'state': 'all',
-                'page': page,
-                'per_page': 50,
-                'sort': 'updated',
-                'direction': 'desc'
-            }
-            
-            if self.sync_state['last_sync']:
-                params['since'] = self.sync_state['last_sync']
-            
             for attempt in range(3):
                 try:
-                    response = requests.get(
-                        f"{self.github_api_url}/repos/{owner}/{repo}/issues",
+                    response = self.github_session.post(
+                        f"{self.github_api_url}/graphql",
                         headers=headers,
-                        params=params,
+                        json={'query': query, 'variables': variables},
                         timeout=30
                     )
                     response.raise_for_status()
@@ -330,47 +1315,96 @@ class PublicGitHubToAstuto:
                     if attempt == 2:
                         logger.error(f"Failed to fetch page {page} after 3 attempts")
                         raise
-                    wait_time = 2 ** attempt
-                    logger.warning(f"Attempt {attempt + 1} failed, waiting {wait_time} seconds...")
+                    response_headers = e.response.headers if e.response is not None else {}
+                    wait_time = backoff_delay(response_headers, attempt, base=1, cap=60)
+                    logger.warning(f"Attempt {attempt + 1} failed, waiting {wait_time:.2f} seconds...")
                     time.sleep(wait_time)
             
-            page_issues = response.json()
-            if not page_issues:
-                break
+            result = response.json()
+            if result.get('errors'):
+                raise Exception(f"GitHub GraphQL error: {result['errors'][0].get('message')}")
             
-            issues.extend(page_issues)
-            logger.info(f"Retrieved {len(page_issues)} issues from page {page}")
+            connection = result['data']['repository'][connection_name]
+            logger.info(f"Retrieved {len(connection['nodes'])} {connection_name} from page {page}")
             
-            if 'X-RateLimit-Remaining' in response.headers:
-                remaining = int(response.headers['X-RateLimit-Remaining'])
-                if remaining < 10:
-                    logger.warning("Rate limit running low, waiting 60 seconds...")
-                    time.sleep(60)
+            self.wait_for_github_budget(response)
+            yield connection['nodes']
             
+            if not connection['pageInfo']['hasNextPage']:
+                break
+            variables['after'] = connection['pageInfo']['endCursor']
             page += 1
+
+    def iter_post_pages(self):
+        """Yield pages of posts from Astuto using limit/offset paging"""
+        url = f"{self.astuto_base_url}/api/v1/posts"
+        seen_ids = set()
+        offset = 0
+        
+        while True:
+            params = {'limit': self.posts_page_size, 'offset': offset}
+            response = self.make_astuto_request('get', url, params=params, headers=self.astuto_headers)
+            page_posts = response.json()
+            new_posts = [post for post in page_posts if post['id'] not in seen_ids]
+            if new_posts:
+                yield new_posts
+            seen_ids.update(post['id'] for post in new_posts)
             
-        return issues
+            # A short page is the last one; an oversized or repeated page means the server ignores paging
+            if len(page_posts) != self.posts_page_size or not new_posts:
+                break
+            offset += self.posts_page_size
 
     def get_all_posts(self):
-        """Fetch all posts from Astuto"""
-        try:
-            response = self.make_astuto_request('get', f"{self.astuto_base_url}/api/v1/posts", headers=self.astuto_headers)
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching existing posts: {e}")
-            return []
+        """Fetch every post from Astuto page by page"""
+        # The posts API promises no ordering, so there is no watermark to stop at; every page is read.
+        # Errors propagate: an empty list here would look like every post was deleted.
+        posts = [post for page_posts in self.iter_post_pages() for post in page_posts]
+        logger.info(f"Fetched {len(posts)} posts")
+        return posts
+
+    def load_issue_to_post(self, full_fetch):
+        """Map GitHub issue numbers to Astuto posts for this run
+
+        Posts are only listed on a full fetch, when an interrupted run left writes to replay (an
+        interrupted create may or may not have reached Astuto), or while the index is empty.
+        Other runs go by the post index alone, with {'id': post_id} standing in for each post.
+        """
+        post_index = self.sync_state['post_index']
+        if full_fetch or not post_index or self.outbox.pending():
+            return self.map_issues_to_posts(self.get_all_posts())
+        logger.info(f"Using the post index for {len(post_index)} posts instead of listing Astuto posts")
+        return {int(issue_num): {'id': post_id} for issue_num, post_id in post_index.items()}
 
     def map_issues_to_posts(self, existing_posts):
-        """Create mapping of GitHub issue numbers to Astuto posts"""
+        """Create mapping of GitHub issue numbers to Astuto posts from the persistent post index
+
+        Index entries whose post is not in existing_posts are dropped, so this runs once per run,
+        before any write, against a listing taken at the start of the run.
+        """
+        post_index = self.sync_state['post_index']
+        posts_by_id = {str(post['id']): post for post in existing_posts}
         issue_to_post = {}
-        for post in existing_posts:
-            desc = post.get('description', '')
-            if 'GitHub Issue #' in desc:
-                try:
-                    issue_num = int(desc.split('GitHub Issue #')[1].split('\n')[0])
-                    issue_to_post[issue_num] = post
-                except (ValueError, IndexError):
-                    continue
+        
+        for issue_num, post_id in list(post_index.items()):
+            post = posts_by_id.pop(str(post_id), None)
+            if post is None:
+                # Post is gone from Astuto
+                del post_index[issue_num]
+            else:
+                issue_to_post[int(issue_num)] = post
+        
+        # Fall back to parsing descriptions for posts the index does not know yet
+        rebuilt = 0
+        for post in posts_by_id.values():
+            footer = parse_post_footer(post.get('description') or '')
+            if footer:
+                issue_to_post[footer.issue_number] = post
+                post_index[str(footer.issue_number)] = post['id']
+                rebuilt += 1
+        
+        if rebuilt:
+            logger.info(f"Added {rebuilt} posts to the issue index from their descriptions")
         return issue_to_post
 
     def create_astuto_post(self, board_id, issue):
@@ -412,6 +1446,7 @@ class PublicGitHubToAstuto:
             logger.info(f"Successfully created Astuto post for issue #{issue['number']}")
             
             if created_post and 'id' in created_post:
+                self.sync_state['post_index'][str(issue['number'])] = created_post['id']
                 self.update_post_status(created_post['id'], issue)
                 
             return created_post
@@ -421,58 +1456,6 @@ class PublicGitHubToAstuto:
                 logger.error(f"Response content: {e.response.text}")
             return None
 
-    def update_existing_post(self, issue, existing_post):
-        """Update existing post with rate limiting"""
-        post_id = existing_post['id']
-        url = f"{self.astuto_base_url}/api/v1/posts/{post_id}"
-        
-        new_title = issue['title'][:128] if len(issue['title']) > 128 else issue['title']
-        new_description = self.format_issue_description(issue)
-        
-        payload = {
-            "title": new_title,
-            "description": new_description,
-            "updated_at": issue['updated_at']
-        }
-        
-        try:
-            self.make_astuto_request('put', url, json=payload, headers=self.astuto_headers)
-            logger.info(f"Updated content for post {post_id}")
-            return True
-        except Exception as e:
-            logger.error(f"Error updating post content: {e}")
-            return False
-
-    def needs_update(self, issue, existing_post):
-        """Check if an issue needs to be updated in Astuto"""
-        issue_number = str(issue['number'])
-        issue_updated = issue['updated_at']
-        
-        if issue_number in self.sync_state['processed_issues']:
-            last_processed = self.sync_state['processed_issues'][issue_number]
-            if last_processed >= issue_updated:
-                return False
-        
-        current_title = existing_post.get('title', '')
-        current_description = existing_post.get('description', '')
-        
-        new_title = issue['title'][:128] if len(issue['title']) > 128 else issue['title']
-        new_description = self.format_issue_description(issue)
-        
-        labels_changed = self.have_labels_changed(issue, existing_post)
-        
-        return (current_title != new_title or 
-                current_description != new_description or 
-                labels_changed)
-
-    def have_labels_changed(self, issue, existing_post):
-        """Check if issue labels have changed"""
-        current_labels = set(label['name'] for label in issue.get('labels', []))
-        desc = existing_post.get('description', '')
-        labels_line = next((line for line in desc.split('\n') if line.startswith('Labels:')), '')
-        existing_labels = set(label.strip() for label in labels_line.replace('Labels:', '').split(',') if label.strip())
-        return current_labels != existing_labels
-
     def format_issue_description(self, issue):
         """Format the description for an Astuto post"""
         labels = ", ".join([label['name'] for label in issue.get('labels', [])])
@@ -486,28 +1469,43 @@ class PublicGitHubToAstuto:
             f"Original URL: [{issue['html_url']}]({issue['html_url']})"
         )
 
-    def update_post_status(self, post_id, issue):
-        """Update post status based on GitHub issue labels with rate limiting"""
+    def resolve_post_status(self, issue):
+        """Pick the (label, status ID) an issue's post should have, or None"""
         matched_statuses = []
         
         for label in issue.get('labels', []):
             label_name = label['name'].lower()
             if label_name in self.astuto_statuses:
                 matched_statuses.append((label_name, self.astuto_statuses[label_name]))
-                logger.info(f"Matched label {label_name} to status ID {self.astuto_statuses[label_name]}")
         
         if not matched_statuses and str(issue.get('board_id')) == "2":
             if "type: bug" in self.astuto_statuses:
                 matched_statuses.append(("type: bug", self.astuto_statuses["type: bug"]))
         
         if matched_statuses:
-            highest_status = max(matched_statuses, key=lambda x: x[1])
+            return max(matched_statuses, key=lambda x: x[1])
+        return None
+
+    def update_post_status(self, post_id, issue):
+        """Update post status based on GitHub issue labels with rate limiting"""
+        highest_status = self.resolve_post_status(issue)
+        
+        if highest_status:
+            logger.info(f"Matched label {highest_status[0]} to status ID {highest_status[1]}")
+            
+            if self.sync_state['post_statuses'].get(str(post_id)) == highest_status[1]:
+                logger.debug(f"Post {post_id} already has status {highest_status[1]}, skipping")
+                with self.stats_lock:
+                    self.skipped_status_updates += 1
+                return True
+            
             url = f"{self.astuto_base_url}/api/v1/posts/{post_id}/update_status"
             payload = {"post_status_id": highest_status[1]}
             
             try:
                 self.make_astuto_request('put', url, json=payload, headers=self.astuto_headers)
                 logger.info(f"Successfully updated post {post_id} status to {highest_status[1]} (from label {highest_status[0]})")
+                self.sync_state['post_statuses'][str(post_id)] = highest_status[1]
                 return True
             except Exception as e:
                 logger.error(f"Error updating post status: {e}")
@@ -517,55 +1515,323 @@ class PublicGitHubToAstuto:
 
     def sync_new_issues(self, owner, repo, board_id):
         """Sync new issues and update existing ones"""
+        if self.streaming:
+            return self.stream_sync_new_issues(owner, repo, board_id)
+        
         logger.info("Starting sync process...")
+        self.begin_sync()
+        started_at = time.time()
+        full_fetch = self.github_since() is None
         issues = self.get_github_issues(owner, repo)
         
         try:
-            existing_posts = self.get_all_posts()
-            issue_to_post = self.map_issues_to_posts(existing_posts)
+            issue_to_post = self.load_issue_to_post(full_fetch)
+            self.replay_outbox(issue_to_post)
+            
+            # Delete posts that no longer exist on GitHub; only a full fetch lists every issue
+            deleted_posts = self.delete_missing_posts(issues, issue_to_post) if full_fetch else 0
+            
+            results = self.process_issues(issues, issue_to_post) + self.flush_writes(issue_to_post)
+            new_issues = results.count('created')
+            updated_issues = results.count('updated')
+                
+            self.finish_sync(full_fetch, started_at, new_issues, updated_issues, deleted_posts)
+            
+        except Exception as e:
+            logger.error(f"Error during sync: {e}")
+            raise
+
+    def stream_sync_new_issues(self, owner, repo, board_id):
+        """Sync issues page by page, starting writes as soon as the first GitHub page arrives"""
+        logger.info("Starting streaming sync process...")
+        self.begin_sync()
+        started_at = time.time()
+        full_fetch = self.github_since() is None
+        
+        try:
+            issue_to_post = self.load_issue_to_post(full_fetch)
+            self.replay_outbox(issue_to_post)
             
             new_issues = 0
             updated_issues = 0
+            github_issue_numbers = set()
             
-            # Delete posts that no longer exist on GitHub
-            deleted_posts = self.delete_missing_posts(issues, existing_posts)
+            for page_issues in self.iter_github_issue_pages(owner, repo):
+                github_issue_numbers.update(issue['number'] for issue in page_issues)
+                results = self.process_issues(page_issues, issue_to_post)
+                new_issues += results.count('created')
+                updated_issues += results.count('updated')
             
-            for issue in issues:
-                # Add delay between operations to prevent rate limiting
-                time.sleep(1)
-                
-                issue_number = issue['number']
+            results = self.flush_writes(issue_to_post)
+            new_issues += results.count('created')
+            updated_issues += results.count('updated')
+            
+            # Deletions need the full set of issue numbers, so they run once every page of a full fetch has been seen
+            deleted_posts = self.delete_posts_not_in(github_issue_numbers, issue_to_post) if full_fetch else 0
+            
+            self.finish_sync(full_fetch, started_at, new_issues, updated_issues, deleted_posts)
+            
+        except Exception as e:
+            logger.error(f"Error during sync: {e}")
+            raise
+
+    def begin_sync(self):
+        """Prepare mappings and counters for a new run"""
+        self.refresh_astuto_mappings_if_stale()
+        self.skipped_status_updates = 0
+        self.max_seen_updated_at = None
+        self.unsaved_issues = 0
+        self.last_checkpoint = time.monotonic()
+
+    def finish_sync(self, full_fetch, started_at, new_issues, updated_issues, deleted_posts):
+        """Record the end of a successful run, save the sync state and log the summary"""
+        # GitHub's own timestamps, so local clock skew cannot open a gap; issues seen again
+        # inside the overlap are skipped by needs_update
+        if self.max_seen_updated_at is not None:
+            self.sync_state['last_sync'] = epoch_to_iso(self.max_seen_updated_at - self.sync_overlap)
+        if full_fetch:
+            self.sync_state['last_full_sync'] = started_at
+        self.save_sync_state()
+        self.outbox.purge_done()
+        
+        logger.info(f"Sync completed. {new_issues} new issues, {updated_issues} updates, {deleted_posts} deletions, "
+                    f"{self.skipped_status_updates} unchanged statuses skipped")
+
+    def process_issues(self, issues, issue_to_post):
+        """Queue the writes the issues need, flushing once the coalescing window has passed"""
+        in_sync = 0
+        for issue in issues:
+            write = self.plan_issue(issue, issue_to_post)
+            if write:
+                self.write_queue.add(write)
+            else:
+                in_sync += 1
+        self.maybe_checkpoint(in_sync)
+        
+        if self.write_queue.due():
+            return self.flush_writes(issue_to_post)
+        return []
+
+    def flush_writes(self, issue_to_post):
+        """Apply every queued write, returning the list of results"""
+        writes, coalesced = self.write_queue.drain()
+        if coalesced:
+            logger.info(f"Coalesced {coalesced} repeated writes")
+        
+        # Record every write before any of them runs so a crash can be replayed
+        entries = list(zip(self.outbox.record(self.outbox_entry(write) for write in writes), writes))
+        
+        results = []
+        if self.sync_workers > 1:
+            # Writes are throttled by the shared rate limiter only.
+            # Chunks finish before each checkpoint so the state is never saved mid-write.
+            with ThreadPoolExecutor(max_workers=self.sync_workers) as executor:
+                for start in range(0, len(entries), self.checkpoint_every):
+                    chunk = entries[start:start + self.checkpoint_every]
+                    results.extend(executor.map(lambda entry: self.run_outbox_entry(*entry, issue_to_post), chunk))
+                    self.maybe_checkpoint(len(chunk))
+            return results
+        
+        for entry_id, write in entries:
+            # Add delay between operations to prevent rate limiting
+            time.sleep(1)
+            results.append(self.run_outbox_entry(entry_id, write, issue_to_post))
+            self.maybe_checkpoint(1)
+        return results
+
+    def outbox_entry(self, write):
+        return (write.kind, write.issue_number, {
+            'issue': write.issue,
+            'existing_post': write.existing_post,
+            'fingerprint': write.fingerprint
+        })
+
+    def run_outbox_entry(self, entry_id, write, issue_to_post):
+        result = self.apply_write(write, issue_to_post)
+        self.outbox.mark_done(entry_id)
+        return result
+
+    def replay_outbox(self, issue_to_post):
+        """Finish writes left unfinished by a previous run that was interrupted"""
+        pending = self.outbox.pending()
+        if not pending:
+            return
+        logger.info(f"Replaying {len(pending)} unfinished Astuto operations")
+        
+        for entry_id, kind, issue_number, payload in pending:
+            if kind == 'delete':
+                if issue_number in issue_to_post:
+                    self.delete_post(payload['post_id'], issue_number)
+                    del issue_to_post[issue_number]
+            else:
+                # The interrupted write may have reached Astuto, so use the post as it is now
                 existing_post = issue_to_post.get(issue_number)
-                
-                if existing_post:
-                    if self.needs_update(issue, existing_post):
-                        if self.update_existing_post(issue, existing_post):
-                            updated_issues += 1
-                else:
-                    assigned_board = self.determine_board(issue.get('labels', []))
-                    if self.create_astuto_post(assigned_board, issue):
-                        new_issues += 1
-                
-                self.sync_state['processed_issues'][str(issue_number)] = issue['updated_at']
-                
-            self.sync_state['last_sync'] = datetime.utcnow().isoformat()
-            self.save_sync_state()
+                write = PendingWrite('update' if existing_post else 'create', issue_number,
+                                     payload['issue'], existing_post, payload['fingerprint'])
+                self.apply_write(write, issue_to_post)
+            self.outbox.mark_done(entry_id)
+            self.maybe_checkpoint(1)
+
+    async def async_sync_new_issues(self, owner, repo, board_id, max_in_flight=None):
+        """Sync new issues and update existing ones with up to max_in_flight concurrent issues"""
+        # More calls in flight than pooled connections would make urllib3 discard connections instead of reusing them
+        max_in_flight = min(max_in_flight or self.max_in_flight, self.pool_size())
+        logger.info(f"Starting async sync process (max {max_in_flight} in flight)...")
+        self.begin_sync()
+        started_at = time.time()
+        full_fetch = self.github_since() is None
+        issues = await asyncio.to_thread(self.get_github_issues, owner, repo)
+        
+        try:
+            issue_to_post = await asyncio.to_thread(self.load_issue_to_post, full_fetch)
+            await asyncio.to_thread(self.replay_outbox, issue_to_post)
+            
+            # Delete posts that no longer exist on GitHub; only a full fetch lists every issue
+            deleted_posts = 0
+            if full_fetch:
+                deleted_posts = await asyncio.to_thread(self.delete_missing_posts, issues, issue_to_post)
+            
+            semaphore = asyncio.Semaphore(max_in_flight)
+            
+            async def sync_one(issue):
+                async with semaphore:
+                    return await asyncio.to_thread(self.sync_issue, issue, issue_to_post)
             
-            logger.info(f"Sync completed. {new_issues} new issues, {updated_issues} updates, {deleted_posts} deletions")
+            results = []
+            for start in range(0, len(issues), self.checkpoint_every):
+                chunk = issues[start:start + self.checkpoint_every]
+                results.extend(await asyncio.gather(*(sync_one(issue) for issue in chunk)))
+                self.maybe_checkpoint(len(chunk))
+            new_issues = results.count('created')
+            updated_issues = results.count('updated')
+            
+            self.finish_sync(full_fetch, started_at, new_issues, updated_issues, deleted_posts)
             
         except Exception as e:
             logger.error(f"Error during sync: {e}")
             raise
 
-    def needs_update(self, issue, existing_post):
+    def plan_sync(self, owner, repo, board_id):
+        """Work out the Astuto operations a sync would perform, and how long they would take, without writing"""
+        logger.info("Planning sync (dry run, nothing is written)...")
+        full_fetch = self.github_since() is None
+        issues = self.get_github_issues(owner, repo)
+        issue_to_post = dict(self.load_issue_to_post(full_fetch))
+        
+        operations = []
+        
+        def plan_write(write):
+            issue = write.issue
+            status = self.resolve_post_status(issue)
+            status_id = status[1] if status else None
+            if write.kind == 'create':
+                operations.append(('create', issue['number'], None))
+                if status_id is not None:
+                    operations.append(('status', issue['number'], None))
+                return
+            post = write.existing_post
+            new_title = issue['title'][:128] if len(issue['title']) > 128 else issue['title']
+            if new_title != post.get('title') or self.format_issue_description(issue) != post.get('description'):
+                operations.append(('update', issue['number'], post['id']))
+            if status_id is not None and self.sync_state['post_statuses'].get(str(post['id'])) != status_id:
+                operations.append(('status', issue['number'], post['id']))
+        
+        # An interrupted run's writes are replayed first, the same way replay_outbox does it
+        replayed = {}
+        for _, kind, issue_number, payload in self.outbox.pending():
+            if kind == 'delete':
+                if issue_to_post.pop(issue_number, None):
+                    operations.append(('delete', issue_number, payload['post_id']))
+                continue
+            existing_post = issue_to_post.get(issue_number)
+            plan_write(PendingWrite('update' if existing_post else 'create', issue_number,
+                                    payload['issue'], existing_post, payload['fingerprint']))
+            if not existing_post:
+                issue_to_post[issue_number] = {'id': None}
+            replayed[issue_number] = iso_to_epoch(payload['issue']['updated_at'])
+        
+        for issue in issues:
+            # The replay already brought these issues up to date
+            if issue['number'] in replayed and iso_to_epoch(issue['updated_at']) <= replayed[issue['number']]:
+                continue
+            write = self.plan_issue(issue, issue_to_post)
+            if write:
+                plan_write(write)
+        
+        if full_fetch:
+            github_issue_numbers = set(issue['number'] for issue in issues)
+            operations.extend(('delete', issue_num, post['id']) for issue_num, post in issue_to_post.items()
+                              if issue_num not in github_issue_numbers)
+        
+        for kind, issue_num, post_id in operations:
+            logger.info(f"Plan: {kind} GitHub Issue #{issue_num}" + (f" (post {post_id})" if post_id else ""))
+        
+        counts = {kind: sum(1 for operation in operations if operation[0] == kind)
+                  for kind in ('create', 'update', 'status', 'delete')}
+        estimated_seconds = self.rate_limiter.estimate_duration(len(operations))
+        if self.sync_workers <= 1 and not self.streaming:
+            # The sequential engine pauses a second before each create or update
+            estimated_seconds = max(estimated_seconds, counts['create'] + counts['update'])
+        
+        logger.info(f"Plan: {counts['create']} creates, {counts['update']} updates, {counts['status']} status changes, "
+                    f"{counts['delete']} deletions; {len(operations)} Astuto requests, estimated {estimated_seconds / 60:.1f} minutes "
+                    f"at {self.rate_limiter.requests_per_window:.0f} requests per {self.rate_limiter.window_size}s")
+        return {'operations': operations, 'counts': counts, 'estimated_seconds': estimated_seconds}
+
+    def sync_issue(self, issue, issue_to_post):
+        """Create or update the Astuto post for a single issue, returning 'created', 'updated' or None"""
+        write = self.plan_issue(issue, issue_to_post)
+        if not write:
+            return None
+        entry_id = self.outbox.record([self.outbox_entry(write)])[0]
+        return self.run_outbox_entry(entry_id, write, issue_to_post)
+
+    def plan_issue(self, issue, issue_to_post):
+        """Work out the write an issue needs, or record it as in sync and return None"""
+        issue_number = issue['number']
+        existing_post = issue_to_post.get(issue_number)
+        fingerprint = issue_fingerprint(issue)
+        
+        if existing_post and not self.needs_update(issue, existing_post, fingerprint):
+            self.sync_state['fingerprints'][str(issue_number)] = fingerprint
+            self.sync_state['processed_issues'][str(issue_number)] = issue['updated_at']
+            return None
+        
+        return PendingWrite('update' if existing_post else 'create', issue_number, issue, existing_post, fingerprint)
+
+    def apply_write(self, write, issue_to_post):
+        """Send a planned write to Astuto, returning 'created', 'updated' or None"""
+        result = None
+        
+        if write.kind == 'update':
+            if self.update_existing_post(write.issue, write.existing_post):
+                result = 'updated'
+        else:
+            assigned_board = self.determine_board(write.issue.get('labels', []))
+            created_post = self.create_astuto_post(assigned_board, write.issue)
+            if created_post:
+                # Later pages or flushes in this run may list the issue again; they must update this post, not create another
+                issue_to_post[write.issue_number] = created_post
+                result = 'created'
+        
+        if result:
+            self.sync_state['fingerprints'][str(write.issue_number)] = write.fingerprint
+        self.sync_state['processed_issues'][str(write.issue_number)] = write.issue['updated_at']
+        return result
+
+    def needs_update(self, issue, existing_post, fingerprint=None):
         """Check if an issue needs to be updated in Astuto"""
         issue_number = str(issue['number'])
         issue_updated = issue['updated_at']
         
-        if issue_number in self.sync_state['processed_issues']:
-            last_processed = self.sync_state['processed_issues'][issue_number]
-            if last_processed >= issue_updated:
-                return False
+        last_processed = self.sync_state['processed_issues'].updated_epoch(issue_number)
+        if last_processed is not None and last_processed >= iso_to_epoch(issue_updated):
+            return False
+        
+        # Compare content hashes when the issue has been synced with a fingerprint before
+        stored_fingerprint = self.sync_state['fingerprints'].get(issue_number)
+        if stored_fingerprint is not None:
+            return stored_fingerprint != (fingerprint or issue_fingerprint(issue))
         
         current_title = existing_post.get('title', '')
         current_description = existing_post.get('description', '')
@@ -582,9 +1848,8 @@ class PublicGitHubToAstuto:
     def have_labels_changed(self, issue, existing_post):
         """Check if issue labels have changed"""
         current_labels = set(label['name'] for label in issue.get('labels', []))
-        desc = existing_post.get('description', '')
-        labels_line = next((line for line in desc.split('\n') if line.startswith('Labels:')), '')
-        existing_labels = set(label.strip() for label in labels_line.replace('Labels:', '').split(',') if label.strip())
+        footer = parse_post_footer(existing_post.get('description') or '')
+        existing_labels = footer.labels if footer else frozenset()
         return current_labels != existing_labels
 
     def update_existing_post(self, issue, existing_post):
@@ -595,15 +1860,20 @@ class PublicGitHubToAstuto:
         new_title = issue['title'][:128] if len(issue['title']) > 128 else issue['title']
         new_description = self.format_issue_description(issue)
         
-        payload = {
-            "title": new_title,
-            "description": new_description,
-            "updated_at": issue['updated_at']
-        }
+        # Only send the fields that differ from the post; status goes through its own endpoint
+        payload = {}
+        if new_title != existing_post.get('title'):
+            payload['title'] = new_title
+        if new_description != existing_post.get('description'):
+            payload['description'] = new_description
         
         try:
-            self.make_astuto_request('put', url, json=payload, headers=self.astuto_headers)
-            logger.info(f"Updated content for post {post_id}")
+            if payload:
+                payload['updated_at'] = issue['updated_at']
+                self.make_astuto_request('put', url, json=payload, headers=self.astuto_headers)
+                logger.info(f"Updated {', '.join(field for field in payload if field != 'updated_at')} for post {post_id}")
+                # Keep the run's copy current in case the issue comes up again before the run ends
+                existing_post.update(payload)
             self.update_post_status(post_id, issue)
             return True
         except Exception as e:
@@ -620,13 +1890,32 @@ def main():
 
     syncer = PublicGitHubToAstuto(
         os.getenv('ASTUTO_API_KEY'),
-        os.getenv('ASTUTO_BASE_URL')
+        os.getenv('ASTUTO_BASE_URL'),
+        max_connections=int(os.getenv('SYNC_MAX_CONNECTIONS', '4')),
+        sync_workers=int(os.getenv('SYNC_WORKERS', '1')),
+        github_concurrency=int(os.getenv('GITHUB_MAX_CONCURRENCY', '4')),
+        github_backend=os.getenv('GITHUB_BACKEND', 'rest').lower(),
+        github_token=os.getenv('GITHUB_TOKEN'),
+        streaming=os.getenv('SYNC_STREAMING', '').lower() in ('1', 'true', 'yes'),
+        coalesce_window=float(os.getenv('SYNC_COALESCE_WINDOW', '0')),
+        state_backend=os.getenv('STATE_BACKEND', 'sqlite').lower(),
+        sync_overlap=int(os.getenv('SYNC_OVERLAP', '300')),
+        max_in_flight=int(os.getenv('SYNC_MAX_IN_FLIGHT', os.getenv('SYNC_MAX_CONNECTIONS', '4')))
     )
 
+    if sys.argv[1:] == ['plan']:
+        syncer.plan_sync('Alpha-Blend-Interactive', 'ChilloutVR', os.getenv('ASTUTO_BOARD_ID'))
+        return
+
+    sync_engine = os.getenv('SYNC_ENGINE', 'sync').lower()
+
     def run_sync():
         try:
             # Updated to use the correct repository owner and name
-            syncer.sync_new_issues('Alpha-Blend-Interactive', 'ChilloutVR', os.getenv('ASTUTO_BOARD_ID'))
+            if sync_engine == 'async':
+                asyncio.run(syncer.async_sync_new_issues('Alpha-Blend-Interactive', 'ChilloutVR', os.getenv('ASTUTO_BOARD_ID')))
+            else:
+                syncer.sync_new_issues('Alpha-Blend-Interactive', 'ChilloutVR', os.getenv('ASTUTO_BOARD_ID'))
             logger.info("Sync completed successfully")
         except Exception as e:
             logger.error(f"Error during sync: {e}")
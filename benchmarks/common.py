@@ -0,0 +1,21 @@
+import importlib.util
+import os
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer
+
+SCRIPT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'CVR to Astuto', 'CVR to Astuto.py')
+
+def load_sync_module():
+    """Import the sync script as a module from a scratch directory, since it writes its log and state files to the working directory"""
+    os.chdir(tempfile.mkdtemp(prefix='cvr-astuto-bench-'))
+    spec = importlib.util.spec_from_file_location('cvr_to_astuto', SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def start_stub_server(handler_class):
+    """Serve handler_class on a free local port in a background thread and return (server, base_url)"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler_class)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
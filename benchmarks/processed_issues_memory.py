@@ -0,0 +1,85 @@
+"""Memory held by the per-issue sync state: plain dicts of strings versus the compact issue maps
+
+Run with: python benchmarks/processed_issues_memory.py [issues]
+
+Reports what each layout keeps alive once built, and the peak while loading the same rows
+from a SQLite state store (the old loader built the string dicts first, then converted them).
+"""
+import hashlib
+import os
+import sys
+import tracemalloc
+
+from common import load_sync_module
+
+def make_rows(count):
+    """(number, updated_at, fingerprint, post_id) rows shaped like a real sync state"""
+    return [(number,
+             f"2024-{number % 12 + 1:02d}-{number % 28 + 1:02d}T{number % 24:02d}:{number % 60:02d}:00Z",
+             hashlib.sha1(str(number).encode()).hexdigest(),
+             100000 + number)
+            for number in range(1, count + 1)]
+
+def build_dicts(rows):
+    state = {'processed_issues': {}, 'fingerprints': {}, 'post_index': {}}
+    for number, updated_at, fingerprint, post_id in rows:
+        state['processed_issues'][str(number)] = updated_at
+        state['fingerprints'][str(number)] = fingerprint
+        state['post_index'][str(number)] = post_id
+    return state
+
+def build_maps(module, rows):
+    state = {key: map_type() for key, map_type in module.ISSUE_STATE_TYPES.items()}
+    for number, updated_at, fingerprint, post_id in rows:
+        state['processed_issues'].load(number, updated_at)
+        state['fingerprints'].load(number, fingerprint)
+        state['post_index'].load(number, post_id)
+    return state
+
+def measure(build):
+    """(bytes still allocated by the result, peak bytes while building it)"""
+    tracemalloc.start()
+    result = build()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained, peak
+
+def load_dicts_from_store(module, store):
+    # What SqliteStateStore.load and load_sync_state did before: string dicts first, then
+    # processed_issues converted to arrays and the rest copied into TrackedDicts
+    with store.lock:
+        state = build_dicts(store.connection.execute("SELECT number, updated_at, fingerprint, post_id FROM issues"))
+    for key in state:
+        state[key] = module.ProcessedIssues(state[key]) if key == 'processed_issues' else module.TrackedDict(state[key])
+    return state
+
+def report(name, retained, peak, count):
+    print(f"{name:<26} retained {retained / 2**20:7.1f} MiB ({retained / count:6.1f} B/issue)   "
+          f"peak {peak / 2**20:7.1f} MiB")
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    module = load_sync_module()
+    rows = make_rows(count)
+
+    dicts, retained, peak = measure(lambda: build_dicts(rows))
+    report('str dicts', retained, peak, count)
+    maps, retained, peak = measure(lambda: build_maps(module, rows))
+    report('issue maps', retained, peak, count)
+    for key in dicts:
+        assert dict(maps[key].items()) == dicts[key], key
+    del dicts, maps
+
+    store = module.SqliteStateStore(os.path.abspath('bench_state.db'))
+    with store.connection:
+        store.connection.executemany("INSERT INTO issues VALUES (?, ?, ?, ?)", rows)
+        store.connection.execute("INSERT INTO watermarks VALUES ('last_sync', 'null')")
+    del rows
+
+    _, retained, peak = measure(lambda: load_dicts_from_store(module, store))
+    report('sqlite load, str dicts', retained, peak, count)
+    _, retained, peak = measure(store.load)
+    report('sqlite load, issue maps', retained, peak, count)
+
+if __name__ == '__main__':
+    main()
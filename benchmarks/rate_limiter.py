@@ -0,0 +1,61 @@
+"""Cost of taking rate limiter permits: the original list-based limiter versus the token bucket
+
+Run with: python benchmarks/rate_limiter.py [acquisitions]
+
+Both limiters are configured so every permit is available immediately, so the timings are
+pure bookkeeping overhead with no sleeping.
+"""
+import sys
+import time
+
+from common import load_sync_module
+
+class ListRateLimiter:
+    """The limiter the sync used before the token bucket, kept verbatim for comparison"""
+    def __init__(self, requests_per_window=100, window_size=300):
+        self.requests_per_window = requests_per_window
+        self.window_size = window_size
+        self.requests = []
+
+    def can_make_request(self):
+        current_time = time.time()
+        self.requests = [req_time for req_time in self.requests
+                        if current_time - req_time < self.window_size]
+        return len(self.requests) < self.requests_per_window
+
+    def add_request(self):
+        self.requests.append(time.time())
+
+    def wait_time(self):
+        if not self.requests:
+            return 0
+        current_time = time.time()
+        oldest_request = min(self.requests)
+        return max(0, self.window_size - (current_time - oldest_request))
+
+def time_list_limiter(count):
+    limiter = ListRateLimiter(requests_per_window=count + 1, window_size=300)
+    start = time.perf_counter()
+    for _ in range(count):
+        # The check-then-record sequence make_astuto_request used to run
+        if not limiter.can_make_request():
+            limiter.wait_time()
+        limiter.add_request()
+    return time.perf_counter() - start
+
+def time_token_bucket(module, count):
+    limiter = module.RateLimiter(requests_per_window=count + 1, window_size=300, burst=count)
+    start = time.perf_counter()
+    for _ in range(count):
+        limiter.acquire()
+    return time.perf_counter() - start
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    module = load_sync_module()
+    for name, elapsed in (('list limiter', time_list_limiter(count)),
+                          ('token bucket', time_token_bucket(module, count))):
+        print(f"{name:<14} {count} acquisitions in {elapsed * 1000:9.1f} ms   {elapsed / count * 1e6:8.2f} us each")
+
+if __name__ == '__main__':
+    main()
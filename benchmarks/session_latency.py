@@ -0,0 +1,72 @@
+"""Per-request latency of one-off requests calls versus the pooled keep-alive session
+
+Run with: python benchmarks/session_latency.py [requests]
+
+The stub server speaks plain HTTP on localhost, so the difference shown is only the TCP
+connection setup; against a real HTTPS host every fresh request also pays a TLS handshake.
+"""
+import json
+import statistics
+import sys
+import time
+from http.server import BaseHTTPRequestHandler
+
+import requests
+
+from common import load_sync_module, start_stub_server
+
+CONNECTIONS = set()
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out as separate writes; with Nagle on, keep-alive responses stall on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        CONNECTIONS.add(self.client_address)
+        body = json.dumps({'id': 1, 'title': 'stub'}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def measure(get, url, count):
+    CONNECTIONS.clear()
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        get(url).raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, len(CONNECTIONS)
+
+def report(name, latencies, connections):
+    latencies = sorted(latencies)
+    print(f"{name:<18} mean {statistics.mean(latencies):6.3f} ms   p50 {latencies[len(latencies) // 2]:6.3f} ms   "
+          f"p95 {latencies[int(len(latencies) * 0.95)]:6.3f} ms   {connections} connections")
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    module = load_sync_module()
+    server, base_url = start_stub_server(StubHandler)
+    url = f"{base_url}/api/v1/posts/1"
+
+    # create_session only needs the concurrency settings, so skip the constructor's network setup
+    syncer = object.__new__(module.PublicGitHubToAstuto)
+    syncer.max_connections = syncer.github_concurrency = syncer.max_in_flight = 4
+    syncer.sync_workers = 1
+    session = syncer.create_session(base_url)
+
+    # Warm up both paths once
+    requests.get(url)
+    session.get(url)
+
+    report('requests.get', *measure(requests.get, url, count))
+    report('pooled session', *measure(session.get, url, count))
+    server.shutdown()
+
+if __name__ == '__main__':
+    main()
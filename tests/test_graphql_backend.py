@@ -0,0 +1,177 @@
+"""The GraphQL backend must return what the REST backend returns, checked against a local stub of both APIs
+
+Run with: python -m unittest discover tests
+"""
+import importlib.util
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+SCRIPT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'CVR to Astuto', 'CVR to Astuto.py')
+PAGE_SIZE = 2  # Small pages so both backends have to follow pagination
+
+ITEMS = [
+    {'number': 1, 'title': 'Crash on start', 'body': 'Steps', 'state': 'open', 'labels': ['type: bug'],
+     'updated_at': '2024-03-05T10:00:00Z'},
+    {'number': 2, 'title': 'No body', 'body': None, 'state': 'closed', 'labels': [],
+     'updated_at': '2024-03-04T10:00:00Z'},
+    {'number': 3, 'title': 'Add feature', 'body': 'Please', 'state': 'open', 'labels': ['status: planned', 'in: game'],
+     'updated_at': '2024-03-01T10:00:00Z'},
+    {'number': 4, 'title': 'Fix crash', 'body': 'Fixes #1', 'state': 'merged', 'labels': ['type: bug'],
+     'updated_at': '2024-03-06T10:00:00Z', 'pull_request': True},
+    {'number': 5, 'title': 'Draft', 'body': None, 'state': 'open', 'labels': [],
+     'updated_at': '2024-03-03T10:00:00Z', 'pull_request': True},
+    {'number': 6, 'title': 'Old change', 'body': 'Old', 'state': 'closed', 'labels': [],
+     'updated_at': '2024-02-01T10:00:00Z', 'pull_request': True},
+]
+
+def item_url(item):
+    return f"https://github.com/owner/repo/{'pull' if item.get('pull_request') else 'issues'}/{item['number']}"
+
+def rest_issue(item):
+    issue = {
+        'number': item['number'],
+        'title': item['title'],
+        'body': item['body'],
+        'state': 'closed' if item['state'] == 'merged' else item['state'],
+        'labels': [{'id': 1, 'name': name, 'color': 'ffffff'} for name in item['labels']],
+        'created_at': '2024-01-01T00:00:00Z',
+        'updated_at': item['updated_at'],
+        'html_url': item_url(item),
+        'comments': 0
+    }
+    if item.get('pull_request'):
+        issue['pull_request'] = {'html_url': item_url(item), 'url': f"https://api.github.com/pulls/{item['number']}"}
+    return issue
+
+def graphql_node(item):
+    return {
+        'number': item['number'],
+        'title': item['title'],
+        'body': item['body'] or '',
+        'state': item['state'].upper(),
+        'labels': {'nodes': [{'name': name} for name in item['labels']]},
+        'createdAt': '2024-01-01T00:00:00Z',
+        'updatedAt': item['updated_at'],
+        'url': item_url(item)
+    }
+
+def newest_first(items):
+    return sorted(items, key=lambda item: item['updated_at'], reverse=True)
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, data, headers=None):
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        if url.path == '/api/v1/boards':
+            return self.send_json([{'id': 2, 'name': 'Bug Reports'}])
+        if url.path == '/api/v1/post_statuses':
+            return self.send_json([{'id': 1, 'name': 'type: bug'}])
+        if url.path == '/repos/owner/repo/issues':
+            items = newest_first(ITEMS)
+            if 'since' in query:
+                items = [item for item in items if item['updated_at'] >= query['since']]
+            page = int(query.get('page', 1))
+            last_page = max(1, -(-len(items) // PAGE_SIZE))
+            link = f'<http://{self.headers["Host"]}{url.path}?page={last_page}>; rel="last"'
+            return self.send_json([rest_issue(item) for item in items[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]],
+                                  {'Link': link})
+        self.send_error(404)
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        variables = request['variables']
+        connection_name = 'pullRequests' if 'pullRequests(' in request['query'] else 'issues'
+        items = [item for item in newest_first(ITEMS) if bool(item.get('pull_request')) == (connection_name == 'pullRequests')]
+        if connection_name == 'issues' and variables.get('since'):
+            items = [item for item in items if item['updated_at'] >= variables['since']]
+        start = int(variables['after'] or 0)
+        end = start + min(variables['first'], PAGE_SIZE)
+        self.send_json({'data': {'repository': {connection_name: {
+            'pageInfo': {'hasNextPage': end < len(items), 'endCursor': str(end)},
+            'nodes': [graphql_node(item) for item in items[start:end]]
+        }}}})
+
+def setUpModule():
+    global sync_module, server, base_url
+    os.chdir(tempfile.mkdtemp(prefix='cvr-astuto-test-'))
+    spec = importlib.util.spec_from_file_location('cvr_to_astuto', SCRIPT_PATH)
+    sync_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(sync_module)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+def tearDownModule():
+    server.shutdown()
+
+class GraphQLBackendTest(unittest.TestCase):
+    def make_syncer(self, backend, last_sync=None):
+        os.chdir(tempfile.mkdtemp(prefix='cvr-astuto-test-'))
+        syncer = sync_module.PublicGitHubToAstuto('key', base_url, github_backend=backend, github_token='token')
+        syncer.github_api_url = base_url
+        syncer.github_session = syncer.create_session(base_url)
+        if last_sync:
+            syncer.sync_state['last_sync'] = last_sync
+            syncer.sync_state['last_full_sync'] = time.time()
+        return syncer
+
+    def fetch(self, backend, last_sync=None):
+        syncer = self.make_syncer(backend, last_sync)
+        issues = syncer.get_github_issues('owner', 'repo')
+        return syncer, {issue['number']: issue for issue in issues}
+
+    def assert_same_results(self, rest, graphql):
+        self.assertEqual(sorted(rest), sorted(graphql))
+        for number, rest_issue in rest.items():
+            graphql_issue = graphql[number]
+            for field in ('title', 'body', 'state', 'created_at', 'updated_at', 'html_url'):
+                self.assertEqual(rest_issue[field], graphql_issue[field], f"#{number} {field}")
+            self.assertEqual([label['name'] for label in rest_issue['labels']],
+                             [label['name'] for label in graphql_issue['labels']])
+            self.assertEqual('pull_request' in rest_issue, 'pull_request' in graphql_issue)
+
+    def test_full_fetch_matches_rest(self):
+        rest_syncer, rest = self.fetch('rest')
+        graphql_syncer, graphql = self.fetch('graphql')
+        self.assertEqual(sorted(graphql), [1, 2, 3, 4, 5, 6])
+        self.assert_same_results(rest, graphql)
+        for number in rest:
+            self.assertEqual(rest_syncer.format_issue_description(rest[number]),
+                             graphql_syncer.format_issue_description(graphql[number]))
+            self.assertEqual(sync_module.issue_fingerprint(rest[number]), sync_module.issue_fingerprint(graphql[number]))
+
+    def test_since_fetch_matches_rest(self):
+        _, rest = self.fetch('rest', last_sync='2024-03-03T10:00:00Z')
+        _, graphql = self.fetch('graphql', last_sync='2024-03-03T10:00:00Z')
+        self.assertEqual(sorted(graphql), [1, 2, 4, 5])
+        self.assert_same_results(rest, graphql)
+
+    def test_watermark_matches_rest(self):
+        rest_syncer, _ = self.fetch('rest')
+        graphql_syncer, _ = self.fetch('graphql')
+        self.assertEqual(rest_syncer.max_seen_updated_at, graphql_syncer.max_seen_updated_at)
+
+if __name__ == '__main__':
+    unittest.main()